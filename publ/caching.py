@@ -39,7 +39,9 @@ def not_modified(etag):
 def get_etag(text):
     """ Compute the etag for the rendered text"""
 
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
+    # SHA-1 is hardware-accelerated on most current CPUs and no slower than
+    # MD5 elsewhere; this is only a cache validator, not a security boundary
+    return hashlib.sha1(text.encode('utf-8'), usedforsecurity=False).hexdigest()
 
 
 class Memoizable(ABC):
@@ -52,14 +54,28 @@ class Memoizable(ABC):
             objects of this class.
         """
 
+    def _memo_key(self):
+        """ Get the object's key, computing it only once; objects are expected
+        to be immutable as far as their key is concerned """
+        # go through __dict__ directly, since some subclasses have a __getattr__
+        try:
+            return self.__dict__['_memoized_key']
+        except KeyError:
+            key = self.__dict__['_memoized_key'] = self._key()
+            return key
+
     def __repr__(self):
         clss = self.__class__.__name__
-        key = self._key()
+        key = self._memo_key()
         return f"{clss}({key})".replace(' ', '_')
 
     def __hash__(self):
-        return hash(self._key())
+        try:
+            return self.__dict__['_memoized_hash']
+        except KeyError:
+            value = self.__dict__['_memoized_hash'] = hash(self._memo_key())
+            return value
 
     def __eq__(self, other):
         # pylint: disable=protected-access
-        return self._key() == other._key()
+        return self._memo_key() == other._memo_key()
@@ -1,13 +1,18 @@
 # cards.py
 """ Rendering functions for Twitter/OpenGraph cards"""
 
+import functools
 import logging
+import re
 import typing
 
 from . import utils
 
 LOGGER = logging.getLogger(__name__)
 
+# Cards only care about images, so documents without any can skip parsing
+IMG_TAG_RE = re.compile(r'<img\b', re.IGNORECASE)
+
 
 class CardData():
     """ Extracted card data """
@@ -24,31 +29,31 @@ class CardData():
 class HtmlCardParser(utils.HTMLTransform):
     """ Parse the card data out of an HTML document """
 
-    def __init__(self, card):
+    def __init__(self, card, max_images: typing.Optional[int] = None):
         super().__init__()
 
         self._card = card
-        self._images = []
+        self._max_images = max_images
 
     def handle_starttag(self, tag, attrs):
         if tag == 'img':
-            src = None
-            width = None
-            height = None
-            for attr, val in attrs:
-                if attr == 'src':
-                    src = val
-                elif attr == 'width':
-                    width = val
-                elif attr == 'height':
-                    height = val
+            attr_map = dict(attrs)
+            src = attr_map.get('src')
             if src:
-                self._card.images.append((src, width, height))
+                self._card.images.append((src, attr_map.get('width'), attr_map.get('height')))
+                if self._max_images is not None and len(self._card.images) >= self._max_images:
+                    raise utils.StopParsing()
+
+
+@functools.lru_cache(maxsize=256)
+def extract_card(html_text: str, max_images: typing.Optional[int] = None) -> CardData:
+    """ Extract card data based on the provided HTML.
 
+    :param max_images: Stop parsing once this many images have been found
 
-def extract_card(html_text: str) -> CardData:
-    """ Extract card data based on the provided HTML. """
+    The result is cached and shared between callers, so it must not be modified. """
     card = CardData()
-    HtmlCardParser(card).feed(html_text)
+    if IMG_TAG_RE.search(html_text):
+        HtmlCardParser(card, max_images).feed(html_text)
 
     return card
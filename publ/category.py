@@ -1,10 +1,14 @@
 # category.py
 """ The Category object passed to entry and category views """
 
+import bisect
 import collections
 import email
+import functools
 import logging
 import os
+import re
+import sys
 import typing
 
 import markupsafe
@@ -20,12 +24,26 @@ LOGGER = logging.getLogger(__name__)
 
 TagCount = collections.namedtuple('TagCount', ['name', 'count'])
 
+# Names made only of words and single spaces, which render to themselves as plain text
+PLAIN_NAME_RE = re.compile(r'[^\W_]+(?: [^\W_]+)*')
+
+
+@functools.lru_cache(maxsize=256)
+def _load_metafile_stat(filepath, mtime_ns, size) -> email.message.Message:
+    """ Memoized backend for load_metafile; the file's modification time and
+    size are only used as part of the cache key """
+    # pylint:disable=unused-argument
+    with open(filepath, 'r', encoding='utf-8') as file:
+        return email.message_from_file(file)
+
 
 def load_metafile(filepath):
-    """ Load a metadata file from the filesystem """
+    """ Load a metadata file from the filesystem, reusing the previously-parsed
+    version if the file hasn't changed. The returned message is shared and
+    must not be modified. """
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            return email.message_from_file(file)
+        stat = os.stat(filepath)
+        return _load_metafile_stat(filepath, stat.st_mtime_ns, stat.st_size)
     except FileNotFoundError:
         LOGGER.warning("Category file %s not found", filepath)
 
@@ -43,6 +61,20 @@ def search_path(category: str) -> str:
     return os.path.join(config.content_folder, category)
 
 
+@utils.stash
+def _visible_categories() -> typing.List[str]:
+    """ Get the sorted paths of all categories which have visible entries;
+    this is shared by all of the request's subcategory listings """
+    return sorted(orm.select(e.category for e in model.Entry if e.visible))  # type:ignore
+
+
+@utils.stash
+def _category_records() -> typing.Dict[str, model.Category]:
+    """ Get all of the category metadata records, keyed by category path; this
+    is fetched once per request rather than once per category """
+    return {record.category: record for record in model.Category.select()}
+
+
 class Category(caching.Memoizable):
     """ Wrapper for category information """
     # pylint: disable=too-few-public-methods,too-many-instance-attributes
@@ -50,12 +82,17 @@ class Category(caching.Memoizable):
     __hash__ = caching.Memoizable.__hash__  # type:ignore
 
     @staticmethod
-    @utils.stash
-    def load(path: str):
+    def load(path: typing.Optional[str]):
         """ Get a category wrapper object
 
         path -- the path to the category
         """
+        return Category._load(path or '')
+
+    @staticmethod
+    @utils.stash
+    def _load(path: str):
+        """ Memoized backend for load, so that '' and None share the root """
         return Category(Category.load.__name__, path)
 
     def __init__(self, create_key, path: str):
@@ -66,22 +103,27 @@ class Category(caching.Memoizable):
         if path is None:
             path = ''
 
-        self.path = path
-        self.basename = os.path.basename(path)
-
-        subcat_query = orm.select(e.category for e in model.Entry if e.visible)  # type:ignore
-        if path:
-            subcat_query = orm.select(
-                c for c in subcat_query if c.startswith(path + '/'))
-        else:
-            subcat_query = orm.select(c for c in subcat_query if c != '')
-        self._subcats_recursive = subcat_query
+        # category paths get compared and hashed a lot, and come from many
+        # different places (routes, the database, metafiles)
+        self.path = sys.intern(str(path))
+        self._parent_path, _, self.basename = self.path.rpartition('/')
 
-        self._record = model.Category.get(category=path)
+        self._record = _category_records().get(path)
 
     def _key(self):
         return self.path
 
+    @cached_property
+    def _subcats_recursive(self) -> typing.List[str]:
+        """ The paths of all of the category's visible subcategories """
+        categories = _visible_categories()
+        if self.path:
+            # everything that starts with 'path/' sorts between 'path/' and 'path0'
+            start = bisect.bisect_left(categories, self.path + '/')
+            end = bisect.bisect_left(categories, self.path + '0', lo=start)
+            return categories[start:end]
+        return [c for c in categories if c]
+
     @cached_property
     def link(self) -> typing.Callable[..., str]:
         """ Returns a link to the category.
@@ -122,12 +164,27 @@ class Category(caching.Memoizable):
 
             # get all the subcategories, with only the first subdir added
 
-            # number of path components to ingest
-            parts = len(self.path.split('/')) + 1 if self.path else 1
-
-            # convert the subcategories into separated pathlists with only 'parts'
-            # parts, then rejoin back into a path and make unique
-            subcats = {'/'.join(c.split('/', parts)[:parts]) for c in self._subcats_recursive}
+            # walk the sorted subcategories, truncating each one at the first
+            # '/' past our own path; a child's descendants all sort together
+            # between 'child/' and 'child0', so skip past them in one step
+            # (the child itself, if present, sorts before them)
+            start = len(self.path) + 1 if self.path else 0
+            categories = self._subcats_recursive
+            subcats = []
+            idx = 0
+            while idx < len(categories):
+                subcat = categories[idx]
+                end = subcat.find('/', start)
+                if end < 0:
+                    subcats.append(subcat)
+                    idx += 1
+                    continue
+
+                child = subcat[:end]
+                pos = bisect.bisect_left(categories, child)
+                if pos == len(categories) or categories[pos] != child:
+                    subcats.append(child)
+                idx = bisect.bisect_left(categories, child + '0', lo=idx)
 
             # convert to a bunch of Category objects
             return sorted([Category.load(c) for c in subcats], key=lambda c: c.sort_name)
@@ -142,10 +199,9 @@ class Category(caching.Memoizable):
         """
         def _first(**spec) -> typing.Optional[entry.Entry]:
             """ Get the earliest entry in this category, optionally including subcategories """
-            for record in self._entries(spec).order_by(model.Entry.local_date,
-                                                       model.Entry.id)[:1]:
-                return entry.Entry.load(record)
-            return None
+            record = self._entries(spec).order_by(model.Entry.local_date,
+                                                  model.Entry.id).first()
+            return entry.Entry.load(record) if record else None
 
         return utils.CallableProxy(_first)
 
@@ -157,10 +213,9 @@ class Category(caching.Memoizable):
         """
         def _last(**spec) -> typing.Optional[entry.Entry]:
             """ Get the latest entry in this category, optionally including subcategories """
-            for record in self._entries(spec).order_by(orm.desc(model.Entry.local_date),
-                                                       orm.desc(model.Entry.id))[:1]:
-                return entry.Entry.load(record)
-            return None
+            record = self._entries(spec).order_by(orm.desc(model.Entry.local_date),
+                                                  orm.desc(model.Entry.id)).first()
+            return entry.Entry.load(record) if record else None
 
         return utils.CallableProxy(_last)
 
@@ -171,6 +226,16 @@ class Category(caching.Memoizable):
 
         return None
 
+    @cached_property
+    def _raw_name(self) -> str:
+        """ The category's name, before any Markdown processing """
+        if self._meta and self._meta.get('name'):
+            # get it from the meta file
+            return str(self._meta.get('name'))
+
+        # infer it from the basename
+        return self.basename.replace('_', ' ').title()
+
     @cached_property
     def name(self) -> typing.Callable[..., str]:
         """ Get the display name of the category. Accepts the following arguments:
@@ -181,12 +246,7 @@ class Category(caching.Memoizable):
             presented
         markdown_extensions -- a list of markdown extensions to use
         """
-        if self._meta and self._meta.get('name'):
-            # get it from the meta file
-            name = self._meta.get('name')
-        else:
-            # infer it from the basename
-            name = self.basename.replace('_', ' ').title()
+        name = self._raw_name
 
         def _name(markup=True, no_smartquotes=False, markdown_extensions=None) -> str:
             return markdown.render_title(name, markup, no_smartquotes,
@@ -221,18 +281,17 @@ class Category(caching.Memoizable):
         For example, path/to/long/category will return a list containing
         Category.load('path'), Category.load('path/to'), and Category.load('path/to/long').
         """
-        ret = []
-        here: typing.Optional[Category] = self
-        while here:
-            ret.append(here)
-            here = here.parent
-        return list(reversed(ret))
+        parts = self.path.split('/') if self.path else []
+        return [Category.load('/'.join(parts[:idx])) for idx in range(len(parts))] + [self]
 
     @cached_property
     def sort_name(self) -> str:
         """ Get the sorting name of this category """
         if self._record and self._record.sort_name:
             return self._record.sort_name
+        if PLAIN_NAME_RE.fullmatch(self._raw_name):
+            # Markdown wouldn't change it, so skip rendering it
+            return self._raw_name
         return self.name(markup=False)
 
     @cached_property
@@ -252,6 +311,10 @@ class Category(caching.Memoizable):
 
     def __getattr__(self, name):
         """ Proxy undefined properties to the meta file """
+        if name.startswith('__') or name in ('_record', '_meta'):
+            # Protocol probes (e.g. __html__, __deepcopy__) aren't metadata, and
+            # looking up our own state here would recurse if it isn't set yet
+            raise AttributeError(name)
         if self._meta:
             return self._meta.get(name)
         return None
@@ -281,14 +344,14 @@ class Category(caching.Memoizable):
     def parent(self) -> typing.Optional["Category"]:
         """ Get the parent category """
         if self.path:
-            return Category.load(os.path.dirname(self.path))
+            return Category.load(self._parent_path)
         return None
 
     @cached_property
     def root(self):
         """ Get the root category object. Equivalent to `breadcrumb[0]` but faster/easier. """
         if self.path:
-            return Category.load(None)
+            return Category.load('')
         return self
 
     def _entries(self, spec):
@@ -330,11 +393,11 @@ def scan_file(fullpath, relpath) -> bool:
         record = model.Category(**values)
 
     # update other relationships to the index
-    path_alias.remove_aliases(record)
-    for alias in meta.get_all('Path-Alias', []):
-        path_alias.set_alias(alias, model.AliasType.REDIRECT, category=record)
-    for alias in meta.get_all('Path-Mount', []):
-        path_alias.set_alias(alias, model.AliasType.MOUNT, category=record)
+    path_alias.set_aliases(record,
+                           [(alias, model.AliasType.REDIRECT)
+                            for alias in meta.get_all('Path-Alias', [])]
+                           + [(alias, model.AliasType.MOUNT)
+                              for alias in meta.get_all('Path-Mount', [])])
 
     orm.commit()
 
@@ -5,6 +5,7 @@ import logging
 import os
 import typing
 
+import flask
 import werkzeug.local
 from dateutil import tz
 
@@ -24,8 +25,10 @@ class _Defaults:
     # Site content locations
     content_folder = 'content'
     template_folder = 'templates'
+    template_cache_folder: typing.Optional[str] = None
     static_folder = 'static'
     static_url_path = '/static'
+    use_x_sendfile = False  # let the front-end server send static files and attachments
 
     # Image rendition cache
     image_output_subdir = '_img'
@@ -84,8 +87,9 @@ class Config(_Defaults):
 
 
 def _get_current():
-    from .flask_wrapper import current_app
-    return current_app.publ_config
+    # Go through flask.current_app directly rather than the typed alias in
+    # flask_wrapper, as this runs on every configuration lookup
+    return flask.current_app.publ_config  # type:ignore
 
 
 config = typing.cast(Config, werkzeug.local.LocalProxy(_get_current))  # pylint:disable=invalid-name
@@ -2,6 +2,7 @@
 
 import datetime
 import email
+import functools
 import hashlib
 import logging
 import os
@@ -26,7 +27,42 @@ LOGGER = logging.getLogger(__name__)
 def load_message(filepath) -> email.message.Message:
     """ Load a message from the filesystem """
     with open(filepath, 'r', encoding='utf-8') as file:
-        return email.message_from_file(file)
+        return email.message_from_string(file.read())
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_message_stat(filepath, mtime_ns, size) -> email.message.Message:
+    """ Memoized backend for load_cached_message; the file's modification time
+    and size are only used as part of the cache key """
+    # pylint:disable=unused-argument
+    return load_message(filepath)
+
+
+def load_cached_message(filepath) -> email.message.Message:
+    """ Load a message from the filesystem, reusing the previously-parsed
+    version if the file hasn't changed. The returned message is shared and
+    must not be modified. """
+    stat = os.stat(filepath)
+    return _load_message_stat(filepath, stat.st_mtime_ns, stat.st_size)
+
+
+def _first_authorized(query, batch_size: int = 10) -> typing.Optional["Entry"]:
+    """ Get the first entry from an ordered query that the current user is
+    allowed to see, fetching a small batch of records at a time """
+    cur_user = user.get_active()
+    offset = 0
+    while True:
+        records = query[offset:offset + batch_size]
+        for record in records:
+            if record.is_authorized(cur_user):
+                return Entry.load(record)
+
+            LOGGER.debug("User unauthorized for entry %d", record.id)
+            tokens.request(cur_user)
+
+        if len(records) < batch_size:
+            return None
+        offset += batch_size
 
 
 class Entry(caching.Memoizable):
@@ -215,15 +251,8 @@ class Entry(caching.Memoizable):
             query = queries.build_query(spec)
             query = queries.where_after_entry(query, self._record)
 
-            cur_user = user.get_active()
-            for record in query.order_by(model.Entry.local_date,
-                                         model.Entry.id):
-                if record.is_authorized(cur_user):
-                    return Entry.load(record)
-
-                LOGGER.debug("User unauthorized for entry %d", record.id)
-                tokens.request(cur_user)
-            return None
+            return _first_authorized(query.order_by(model.Entry.local_date,
+                                                    model.Entry.id))
         return CallableProxy(_next)
 
     @cached_property
@@ -240,15 +269,8 @@ class Entry(caching.Memoizable):
             query = queries.build_query(spec)
             query = queries.where_before_entry(query, self._record)
 
-            cur_user = user.get_active()
-            for record in query.order_by(orm.desc(model.Entry.local_date),
-                                         orm.desc(model.Entry.id)):
-                if record.is_authorized(cur_user):
-                    return Entry.load(record)
-
-                LOGGER.debug("User unauthorized for entry %d", record.id)
-                tokens.request(cur_user)
-            return None
+            return _first_authorized(query.order_by(orm.desc(model.Entry.local_date),
+                                                    orm.desc(model.Entry.id)))
         return CallableProxy(_previous)
 
     @cached_property
@@ -289,7 +311,7 @@ class Entry(caching.Memoizable):
         LOGGER.debug("Loading entry %d from %s", self._record.id, self._record.file_path)
         filepath = self._record.file_path
         try:
-            return load_message(filepath)
+            return load_cached_message(filepath)
         except FileNotFoundError:
             expire_record(self._record)
             empty = email.message.Message()
@@ -417,7 +439,7 @@ class Entry(caching.Memoizable):
             tags += og_tag('og:url', self.link(absolute=True))
 
             body, more, is_markdown = self._entry_content
-            html_text = self._get_markup(body + '\n\n' + more,
+            html_text = self._get_markup(body + '\n\n' + more if more else body,
                                          is_markdown,
                                          args={'count': 1,
                                                **kwargs,
@@ -426,9 +448,10 @@ class Entry(caching.Memoizable):
                                                "_no_resize_external": True,
                                                "absolute": True},
                                          counter=markdown.ItemCounter())
-            card = cards.extract_card(html_text)
+            count = kwargs.get('count', 1)
+            card = cards.extract_card(html_text, count)
 
-            for (img, width, height) in card.images[:kwargs.get('count', 1)]:
+            for (img, width, height) in card.images[:count]:
                 tags += og_tag('og:image', img)
                 if width:
                     tags += og_tag('og:image:width', width)
@@ -850,14 +873,17 @@ def scan_file(fullpath: str, relpath: typing.Optional[str], fixup_pass: int) ->
 
     title = entry.get('title', '')
 
+    # Only run the title through Markdown if we actually need it for the slug
+    slug_text = entry.get('Slug-Text')
+    if slug_text is None:
+        slug_text = markdown.render_title(title, markup=False, smartquotes=False)
+
     values: typing.Dict[str, typing.Any] = {
         'file_path': fullpath,
         'category': entry.get('Category', utils.get_category(relpath)),
         'status': model.PublishStatus[entry.get('Status', 'SCHEDULED').upper()].value,
         'entry_type': entry.get('Entry-Type', ''),
-        'slug_text': slugify.slugify(
-            entry.get('Slug-Text',
-                      markdown.render_title(title, markup=False, smartquotes=False))),
+        'slug_text': slugify.slugify(slug_text),
         'redirect_url': entry.get('Redirect-To', ''),
         'title': title,
         'sort_title': entry.get('Sort-Title', title),
@@ -925,14 +951,15 @@ def scan_file(fullpath: str, relpath: typing.Optional[str], fixup_pass: int) ->
         fixup_needed = True
 
     # add other relationships to the index
-    path_alias.remove_aliases(record)
+    aliases = []
     if record.visible:
-        for alias in entry.get_all('Path-Alias', []):
-            path_alias.set_alias(alias, model.AliasType.REDIRECT, entry=record)
-        for alias in entry.get_all('Path-Mount', []):
-            path_alias.set_alias(alias, model.AliasType.MOUNT, entry=record)
-        for alias in entry.get_all('Path-Canonical', []):
-            path_alias.set_alias(alias, model.AliasType.MOUNT, entry=record)
+        aliases += [(alias, model.AliasType.REDIRECT)
+                    for alias in entry.get_all('Path-Alias', [])]
+        aliases += [(alias, model.AliasType.MOUNT)
+                    for alias in entry.get_all('Path-Mount', [])]
+        aliases += [(alias, model.AliasType.MOUNT)
+                    for alias in entry.get_all('Path-Canonical', [])]
+    path_alias.set_aliases(record, aliases)
 
     with orm.db_session:
         set_tags = {
@@ -2,6 +2,7 @@
 
 import functools
 import logging
+import os
 import re
 import typing
 
@@ -12,11 +13,88 @@ from werkzeug.utils import cached_property
 
 # pylint:disable=cyclic-import
 from . import (caching, cli, config, entry, html_entry, image, index,
-               maintenance, model, rendering, search, tokens, user, utils,
-               view)
+               maintenance, model, rendering, search, template, tokens, user,
+               utils, view)
 
 LOGGER = logging.getLogger(__name__)
 
+# Group name prefix for the combined path-alias regex
+_REGEX_GROUP = '_publ_alias'
+
+# Patterns that refer back to their own groups can't be combined
+_REGEX_BACKREF = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+
+class PathRegexes:
+    """ The registered path-alias regular expressions and their handlers """
+
+    def __init__(self) -> None:
+        self._patterns: typing.List[re.Pattern] = []
+        self._funcs: typing.List[typing.Callable] = []
+        self._combined: typing.Optional[re.Pattern] = None
+        self._combined_ready = False
+        self._lookup = functools.lru_cache(maxsize=4096)(self._find)
+
+    def add(self, regex, func):
+        """ Add a path-alias regex and its handler """
+        self._patterns.append(re.compile(regex))
+        self._funcs.append(func)
+        self._combined = None
+        self._combined_ready = False
+        self._lookup.cache_clear()
+        return func
+
+    def _get_combined(self) -> typing.Optional[re.Pattern]:
+        """ Get a single regex which finds the first path-alias regex that
+        matches a path, or None if the regexes can't be safely combined """
+        if not self._combined_ready:
+            self._combined_ready = True
+            # Backreferences would be renumbered, and flags can't be mixed
+            if self._patterns and not any(
+                    regex.flags != re.UNICODE or _REGEX_BACKREF.search(regex.pattern)
+                    for regex in self._patterns):
+                try:
+                    self._combined = re.compile('|'.join(
+                        f'(?P<{_REGEX_GROUP}{idx}>{regex.pattern})'
+                        for idx, regex in enumerate(self._patterns)))
+                except re.error as err:
+                    LOGGER.info("Path-alias regexes can't be combined: %s", err)
+
+        return self._combined
+
+    def _find(self, path) -> typing.Optional[int]:
+        """ Find the index of the first path-alias regex that matches a path """
+        combined = self._get_combined()
+        if combined:
+            match = combined.match(path)
+            if not match or match.lastgroup is None:
+                return None
+            return int(match.lastgroup[len(_REGEX_GROUP):])
+
+        for idx, regex in enumerate(self._patterns):
+            if regex.match(path):
+                return idx
+        return None
+
+    def test(self, path):
+        """ Returns the result of the first handler whose regex matches the
+        path and which returns a destination """
+        # Most paths don't match any alias, and the same paths tend to get
+        # requested repeatedly, so remember where to start for each one
+        start = self._lookup(path)
+        if start is None:
+            return None, None
+
+        # If the first handler declines, the rest are checked in order as usual
+        for idx in range(start, len(self._patterns)):
+            match = self._patterns[idx].match(path)
+            if match:
+                dest, permanent = self._funcs[idx](match)
+                if dest:
+                    return dest, permanent
+
+        return None, None
+
 
 class Publ(flask.Flask):
     """ A Publ application.
@@ -40,8 +118,13 @@ class Publ(flask.Flask):
             See https://docs.ponyorm.org/database.html for more information
         * ``content_folder``: The folder that stores the site content
         * ``template_folder``: The folder that contains the Jinja templates
+        * ``template_cache_folder``: A folder to store compiled templates in,
+            so that they don't need to be recompiled when the app restarts
         * ``static_folder``: The folder that contains static content
         * ``static_url_path``: The URL mount point for the static content folder
+        * ``use_x_sendfile``: Whether to let the front-end web server send
+            static files and attachments via ``X-Sendfile``, rather than
+            sending them through Python
         * ``image_output_subdir``: The subdirectory of the static content folder to
             store the image rendition cache
         * ``index_rescan_interval``: How frequently (in seconds) to rescan the
@@ -88,7 +171,7 @@ class Publ(flask.Flask):
         if 'AUTH_FORCE_SSL' in self.publ_config.auth:
             raise ValueError('AUTH_FORCE_SSL is deprecated; use AUTH_FORCE_HTTPS instead')
 
-        self._regex_map = []
+        self._path_regexes = PathRegexes()
 
         self.url_map.converters['category'] = utils.CategoryConverter
         self.url_map.converters['template'] = utils.TemplateConverter
@@ -126,6 +209,12 @@ class Publ(flask.Flask):
         self.register_error_handler(
             werkzeug.exceptions.HTTPException, rendering.render_exception)
 
+        if self.publ_config.template_cache_folder:
+            import jinja2
+            os.makedirs(self.publ_config.template_cache_folder, exist_ok=True)
+            self.jinja_env.bytecode_cache = jinja2.FileSystemBytecodeCache(
+                self.publ_config.template_cache_folder)
+
         self.jinja_env.globals.update(  # pylint: disable=no-member
             get_view=view.get_view,
             arrow=arrow,
@@ -143,6 +232,10 @@ class Publ(flask.Flask):
 
         caching.init_app(self, self.publ_config.cache)
 
+        # The Cache-Control header for pages that don't depend on the user
+        timeout = self.publ_config.cache.get('CACHE_DEFAULT_TIMEOUT')
+        self.public_cache_control = f'public, max-age={timeout}' if timeout else 'public'
+
         def logout(redir=''):
             """ Log out from the thing """
             if flask.request.method == 'POST':
@@ -153,20 +246,22 @@ class Publ(flask.Flask):
                 flask.session.pop('me')
                 return flask.redirect('/' + redir)
 
-            tmpl = rendering.map_template('/', 'logout')
+            tmpl = rendering.map_template('', 'logout')
             return rendering.render_publ_template(tmpl)[0]
 
         self.config.update(
             SESSION_COOKIE_HTTPONLY=True,
             SESSION_COOKIE_SAMESITE='Lax')
 
+        if self.publ_config.use_x_sendfile:
+            self.config['USE_X_SENDFILE'] = True
+
         # Set the secret key from configuration if we have it, otherwise set it
         # randomly
         if self.publ_config.secret_key:
             self.secret_key = self.publ_config.secret_key
         else:
-            import uuid
-            self.secret_key = uuid.uuid4().hex
+            self.secret_key = os.urandom(32)
 
         if self.auth:
             for route in [
@@ -216,17 +311,20 @@ class Publ(flask.Flask):
         if self.publ_config.index_rescan_interval:
             self._maint.register(functools.partial(index.scan_index,
                                                    self.publ_config.content_folder),
-                                 self.publ_config.index_rescan_interval)
+                                 self.publ_config.index_rescan_interval,
+                                 'index.scan_index')
 
         if self.publ_config.image_cache_interval and self.publ_config.image_cache_age:
             self._maint.register(functools.partial(image.clean_cache,
                                                    self.publ_config.image_cache_age),
-                                 self.publ_config.image_cache_interval)
+                                 self.publ_config.image_cache_interval,
+                                 'image.clean_cache')
 
         if self.publ_config.auth_log_prune_interval and self.publ_config.auth_log_prune_age:
             self._maint.register(functools.partial(user.prune_log,
                                                    self.publ_config.auth_log_prune_age),
-                                 self.publ_config.auth_log_prune_interval)
+                                 self.publ_config.auth_log_prune_interval,
+                                 'user.prune_log')
 
         self.before_request(self._maint.run)
 
@@ -293,7 +391,9 @@ class Publ(flask.Flask):
         """ Add a path-alias regex callback to the request router. Takes the
         following arguments:
 
-        regex -- The regular expression for the path-alias hook
+        regex -- The regular expression for the path-alias hook. This is
+            matched against the start of the path, as with `re.match`; end it
+            with `$` if it needs to match the entire path.
         f -- A function taking a `re.match` object on successful match, and
             returns a tuple of `(url, is_permanent)`; url can be `None` if the
             function decides it should not redirect after all.
@@ -301,21 +401,13 @@ class Publ(flask.Flask):
         The function may also use `flask.request.args` or the like if it needs
         to make a determination based on query args.
         """
-        self._regex_map.append((regex, func))
-        return func
+        return self._path_regexes.add(regex, func)
 
     def test_path_regex(self, path):
         """ Evaluate the registered path-alias regular expressions. Returns the
         result of the first handler that successfully matches the path.
         """
-        for regex, func in self._regex_map:
-            match = re.match(regex, path)
-            if match:
-                dest, permanent = func(match)
-                if dest:
-                    return dest, permanent
-
-        return None, None
+        return self._path_regexes.test(path)
 
     def _startup(self):
         """ Startup routine for initiating the content indexer """
@@ -334,7 +426,30 @@ class Publ(flask.Flask):
             if not ctx or ctx.info_name == 'run':
                 index.scan_index(self.publ_config.content_folder)
                 if self.publ_config.index_enable_watchdog:
-                    index.background_scan(self.publ_config.content_folder)
+                    # Setting up recursive watches walks the whole tree, so do
+                    # it in the background too
+                    self.indexer.submit(index.background_scan,
+                                        self.publ_config.content_folder)
+                    self.indexer.submit(template.background_watch,
+                                        self.publ_config.template_folder)
+                # Precompile in the background, so that it doesn't hold up startup
+                self.indexer.submit(self._precompile_templates)
+
+    def _precompile_templates(self):
+        """ Compile all of the site templates ahead of time, so that the first
+        request for each one doesn't have to pay for it """
+        import jinja2
+
+        count = 0
+        for name in self.jinja_env.list_templates():
+            try:
+                self.jinja_env.get_template(name)
+                count += 1
+            except jinja2.TemplateSyntaxError as err:
+                LOGGER.warning("%s:%d: %s", err.filename, err.lineno, err.message)
+            except (jinja2.TemplateError, UnicodeDecodeError) as err:
+                LOGGER.debug("Not precompiling %s: %s", name, err)
+        LOGGER.info("Precompiled %d templates", count)
 
 
 current_app = typing.cast(Publ, flask.current_app)  # pylint:disable=invalid-name
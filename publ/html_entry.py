@@ -19,6 +19,10 @@ HTML_PLAINTEXT_ELEMENTS = (
     'kbd', 'label', 'q', 'samp', 'span', 'strong', 'sub', 'sup', 'time', 'tt',
     'var', 'mark', 'p')
 
+# Attributes whose values are links to be resolved, depending on whether the tag is an <img>
+LINK_ATTRS = frozenset(('href', 'src'))
+LINK_ATTRS_IMG = frozenset(('href',))
+
 
 class HTMLEntry(utils.HTMLTransform):
     """ An HTML manipulator to fixup src and href attributes """
@@ -60,15 +64,15 @@ class HTMLEntry(utils.HTMLTransform):
         self_closing -- whether this is self-closing
         """
 
-        if tag.lower() == 'img':
+        is_img = tag.lower() == 'img'
+        if is_img:
             attrs = self._image_attrs(attrs)
 
-        # Remap the attributes
+        # Remap the attributes; <img src> has already been handled
+        link_attrs = LINK_ATTRS_IMG if is_img else LINK_ATTRS
         out_attrs = []
         for key, val in attrs:
-            if (key.lower() == 'href'
-                    or key.startswith('$')
-                    or (key.lower() == 'src' and tag.lower() != 'img')):
+            if key.lower() in link_attrs or key.startswith('$'):
                 if key.startswith('$'):
                     key = key[1:]
                 out_attrs.append((key, links.resolve(
@@ -231,6 +235,7 @@ class FirstParagraph(utils.HTMLTransform):
             self.append(utils.make_tag(tag, attrs))
 
         self._tag_stack.append((tag.lower(), consume, insert_tag))
+        self._check_done()
 
     def handle_endtag(self, tag):
         popped = None
@@ -245,6 +250,13 @@ class FirstParagraph(utils.HTMLTransform):
         # we're done if we've closed a paragraph and text has been consumed
         if tag.lower() == 'p' and self._found:
             self._done = True
+        self._check_done()
+
+    def _check_done(self):
+        """ Stop parsing once the paragraph is done and all of the tags we
+        emitted have been closed, as nothing else can be output after that """
+        if self._done and not any(inserted for _, _, inserted in self._tag_stack):
+            raise utils.StopParsing()
 
     def handle_startendtag(self, tag, attrs):
         if self.consuming and tag in HTML_PLAINTEXT_ELEMENTS:
@@ -1,6 +1,7 @@
 """ Handlers for images and files """
 
 import errno
+import functools
 import hashlib
 import html
 import io
@@ -9,7 +10,6 @@ import logging
 import os
 import random
 import re
-import time
 import typing
 
 import flask
@@ -166,10 +166,11 @@ def _get_asset(file_path):
     return record
 
 
+@utils.stash
 def get_image(path: str, search_path: typing.Union[str, utils.ListLike[str]]) -> Image:
     """ Get an Image object. If the path is given as absolute, it will be
     relative to the content directory; otherwise it will be relative to the
-    search path.
+    search path. The lookup is memoized for the duration of the request.
 
     path -- the image's filename
     search_path -- a search path for the image (string or list of strings)
@@ -270,7 +271,8 @@ def get_async(render_spec: str):
         if not asset:
             raise http_error.NotFound(f"File not found: {file_path}")
         renderer = LocalImage(asset, [])
-        output_path, _, pending = renderer.render_async(output_scale, **args)
+        # give the renderer a moment to finish before telling the client to retry
+        output_path, _, pending = renderer.render_async(output_scale, wait=0.25, **args)
     except FileNotFoundError as err:
         raise http_error.NotFound(f"File not found: {file_path}") from err
 
@@ -282,7 +284,6 @@ def get_async(render_spec: str):
 
     retry_count = int(flask.request.args.get('retry_count', 0))
     if retry_count < 10:
-        time.sleep(0.25)  # ghastly hack to get the client to backoff a bit
         return flask.redirect(flask.url_for('async',
                                             render_spec=render_spec,
                                             cb=random.randint(0, 2**48),
@@ -293,15 +294,21 @@ def get_async(render_spec: str):
 
 def make_placeholder(output_path: str):
     """ Generate a placeholder image for the given file path """
-    vals = [int(b) for b in hashlib.md5(
-        output_path.encode('utf-8')).digest()[0:12]]
-    placeholder = PIL.Image.new('RGB', (2, 2))
-    placeholder.putdata(list(zip(vals[0::3], vals[1::3], vals[2::3])))
-    outbytes = io.BytesIO()
-    placeholder.save(outbytes, "PNG")
-    outbytes.seek(0)
+    digest = hashlib.md5(output_path.encode('utf-8'),
+                         usedforsecurity=False).digest()[0:12]
 
     response = flask.make_response(
-        flask.send_file(outbytes, mimetype='image/png'))
+        flask.send_file(io.BytesIO(_placeholder_png(digest)), mimetype='image/png'))
     response.headers['Refresh'] = '5'
     return response
+
+
+@functools.lru_cache(maxsize=1024)
+def _placeholder_png(digest: bytes) -> bytes:
+    """ Encode the 2x2 placeholder PNG for a color digest """
+    vals = list(digest)
+    placeholder = PIL.Image.new('RGB', (2, 2))
+    placeholder.putdata(list(zip(vals[0::3], vals[1::3], vals[2::3])))
+    outbytes = io.BytesIO()
+    placeholder.save(outbytes, "PNG")
+    return outbytes.getvalue()
@@ -81,12 +81,25 @@ def fix_orientation(image: PIL.Image.Image) -> PIL.Image.Image:
     return image
 
 
+def _touch(path: str) -> bool:
+    """ Update a file's access time, returning whether it exists """
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
 class LocalImage(Image):
     """ The basic Image class, which knows about the base version and how to
     generate renditions from it """
 
     _thread_pool = None
 
+    # renditions which are currently queued or rendering, keyed by full path
+    _pending: typing.Dict[str, concurrent.futures.Future] = {}
+    _pending_lock = threading.Lock()
+
     @staticmethod
     def thread_pool():
         """ Get the rendition threadpool """
@@ -132,14 +145,14 @@ class LocalImage(Image):
             out_basename)
         out_fullpath = os.path.join(config.static_folder, out_rel_path)
 
-        if os.path.isfile(out_fullpath):
+        if out_fullpath in LocalImage._pending:
+            LOGGER.debug("rendition %s is already being rendered", out_fullpath)
+            pending = True
+        elif _touch(out_fullpath):
             LOGGER.debug("rendition %s already exists", out_fullpath)
-            os.utime(out_fullpath)
             pending = False
         elif render:
-            LOGGER.debug("scheduling %s for render", out_fullpath)
-            LocalImage.thread_pool().submit(
-                self._render, out_fullpath, [op for _, op in pipeline if op], out_args)
+            self._submit_render(out_fullpath, [op for _, op in pipeline if op], out_args)
             pending = True
         else:
             LOGGER.debug("rendition %s does not exist, waiting for a real request", out_fullpath)
@@ -253,6 +266,22 @@ class LocalImage(Image):
                                                      resample=scale_filter))
         return size, None
 
+    def _submit_render(self, path, operations: typing.List[typing.Callable], out_args):
+        """ Schedule a rendition, unless it's already scheduled """
+        with LocalImage._pending_lock:
+            if path in LocalImage._pending:
+                return
+
+            LOGGER.debug("scheduling %s for render", path)
+            future = LocalImage.thread_pool().submit(self._render, path, operations, out_args)
+            LocalImage._pending[path] = future
+
+        def done(_):
+            with LocalImage._pending_lock:
+                if LocalImage._pending.get(path) is future:
+                    del LocalImage._pending[path]
+        future.add_done_callback(done)
+
     def _render(self, path, operations: typing.List[typing.Callable], out_args):
         image = self._image
 
@@ -320,10 +349,19 @@ class LocalImage(Image):
                 _external=kwargs.get('absolute')), size
         return utils.static_url(out_rel_path, kwargs.get('absolute')), size
 
-    def render_async(self, output_scale, **kwargs):
-        """ Initiate the rendering of an image """
+    def render_async(self, output_scale, wait: float = 0, **kwargs):
+        """ Initiate the rendering of an image
+
+        :param wait: how long to wait for a pending rendition to finish, in seconds
+        """
         out_rel_path, size, pending = self._get_rendition(output_scale, True, **kwargs)
-        return utils.static_url(out_rel_path, kwargs.get('absolute')), size, pending
+        if pending and wait:
+            out_fullpath = os.path.join(config.static_folder, out_rel_path)
+            future = LocalImage._pending.get(out_fullpath)
+            if future:
+                concurrent.futures.wait([future], timeout=wait)
+            pending = not os.path.isfile(out_fullpath)
+        return utils.static_url(out_rel_path, bool(kwargs.get('absolute'))), size, pending
 
     @cached_property
     def _image(self):
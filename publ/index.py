@@ -19,6 +19,9 @@ LOGGER = logging.getLogger(__name__)
 ENTRY_TYPES = ['.md', '.htm', '.html']
 CATEGORY_TYPES = ['.cat', '.meta']
 
+# How many completed files to record per fingerprint transaction
+FINGERPRINT_BATCH_SIZE = 256
+
 
 class Indexer:
     """ Class which handles the scheduling of file indexing """
@@ -112,11 +115,19 @@ class Indexer:
             self._pending = set()
         LOGGER.debug("Processing %d files", len(items))
 
-        # process the known items
+        # process the known items, recording the fingerprints of the finished
+        # files in batches rather than one transaction per file
+        scanned: typing.List[str] = []
         for item in items:
-            self._scan_file(*item)
+            if self._scan_file(*item):
+                scanned.append(item[0])
+            if len(scanned) >= FINGERPRINT_BATCH_SIZE:
+                self._set_scanned(scanned)
+                scanned = []
             with self._lock:
                 self._in_progress -= 1
+        if scanned:
+            self._set_scanned(scanned)
 
         # and then schedule a catchup for anything that happened
         # while this scan was happening
@@ -126,7 +137,9 @@ class Indexer:
             with self._lock:
                 self._in_progress = 0
 
-    def _scan_file(self, fullpath: str, relpath: typing.Optional[str], fixup_pass: int):
+    def _scan_file(self, fullpath: str, relpath: typing.Optional[str], fixup_pass: int) -> bool:
+        """ Scan a file; returns whether it's done, or False if a fixup pass
+        was scheduled """
         LOGGER.debug("Scanning file: %s (%s) pass=%d", fullpath, relpath, fixup_pass)
 
         def do_scan() -> typing.Optional[bool]:
@@ -151,11 +164,15 @@ class Indexer:
         if result is False and fixup_pass < 5:
             LOGGER.info("Scheduling fixup pass %d for %s", fixup_pass + 1, fullpath)
             self.scan_file(fullpath, relpath, fixup_pass + 1)
-        else:
-            LOGGER.debug("%s complete", fullpath)
-            set_fingerprint(fullpath)
-            self.last_indexed = fullpath
-        return result
+            return False
+
+        LOGGER.debug("%s complete", fullpath)
+        return True
+
+    def _set_scanned(self, fullpaths: typing.List[str]):
+        """ Record the fingerprints of a batch of completed files """
+        set_fingerprints(fullpaths)
+        self.last_indexed = fullpaths[-1]
 
 
 def last_indexed() -> typing.Optional[str]:
@@ -195,9 +212,37 @@ def get_last_fingerprint(fullpath: str) -> typing.Optional[str]:
     return None
 
 
+@orm.db_session
+def get_last_fingerprints(fullpaths: typing.List[str]) -> typing.Dict[str, str]:
+    """ Get the last known fingerprints for a batch of files """
+    result: typing.Dict[str, str] = {}
+    # Keep the batches well within SQLite's query parameter limit
+    for start in range(0, len(fullpaths), 500):
+        batch = fullpaths[start:start + 500]
+        result.update(orm.select((fp.file_path, fp.fingerprint)
+                                 for fp in model.FileFingerprint  # type:ignore
+                                 if fp.file_path in batch))
+    return result
+
+
 @orm.db_session(retry=5)
 def set_fingerprint(fullpath, fingerprint=None):
     """ Set the last known modification time for a file """
+    _set_fingerprint(fullpath, fingerprint)
+    orm.commit()
+
+
+@orm.db_session(retry=5)
+def set_fingerprints(fullpaths: typing.List[str]):
+    """ Set the last known modification times for a batch of files, in a
+    single transaction """
+    for fullpath in fullpaths:
+        _set_fingerprint(fullpath)
+    orm.commit()
+
+
+def _set_fingerprint(fullpath, fingerprint=None):
+    """ Update a file's fingerprint record within the current session """
     try:
         fingerprint = fingerprint or utils.file_fingerprint(fullpath)
 
@@ -210,7 +255,6 @@ def set_fingerprint(fullpath, fingerprint=None):
                 file_path=fullpath,
                 fingerprint=fingerprint,
                 file_mtime=os.stat(fullpath).st_mtime)
-        orm.commit()
     except FileNotFoundError:
         orm.delete(fp for fp in model.FileFingerprint if fp.file_path == fullpath)
 
@@ -306,23 +350,29 @@ def scan_index(content_dir, wait_start=True) -> None:
         """ Helper function to scan a single directory """
         LOGGER.debug("scanning directory %s", root)
         try:
-            for file in files:
-                fullpath = os.path.join(root, file)
-                relpath = os.path.relpath(fullpath, content_dir)
+            fullpaths = [os.path.join(root, file) for file in files]
+            fullpaths = [fullpath for fullpath in fullpaths if is_scannable(fullpath)]
+            last_fingerprints = get_last_fingerprints(fullpaths)
 
-                if not is_scannable(fullpath):
-                    continue
+            for fullpath in fullpaths:
+                relpath = os.path.relpath(fullpath, content_dir)
 
                 fingerprint = utils.file_fingerprint(fullpath)
-                last_fingerprint = get_last_fingerprint(fullpath)
+                last_fingerprint = last_fingerprints.get(fullpath)
                 if fingerprint != last_fingerprint:
                     LOGGER.debug("%s: %s -> %s", fullpath, last_fingerprint, fingerprint)
                     indexer.scan_file(fullpath, relpath, 0, wait_start)
         except Exception:  # pylint:disable=broad-except
             LOGGER.exception("Got error parsing directory %s", root)
 
-    for root, _, files in os.walk(content_dir, followlinks=True):
-        indexer.submit(scan_directory, root, files)
+    def walk():
+        """ Helper function to find the directories to scan """
+        for root, _, files in os.walk(content_dir, followlinks=True):
+            indexer.submit(scan_directory, root, files)
+
+        for table in (model.Entry, model.Category, model.Image, model.FileFingerprint):
+            indexer.submit(prune_missing, table)
 
-    for table in (model.Entry, model.Category, model.Image, model.FileFingerprint):
-        indexer.submit(prune_missing, table)
+    # Walk the content directory from the indexer thread, so that neither
+    # startup nor the periodic rescan blocks on the filesystem
+    indexer.submit(walk)
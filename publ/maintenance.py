@@ -1,8 +1,12 @@
 """ Periodic maintenance tasks """
 
+import logging
+import threading
 import time
 import typing
 
+LOGGER = logging.getLogger(__name__)
+
 
 class Maintenance:
     """ Container for periodic maintenance tasks """
@@ -11,17 +15,42 @@ class Maintenance:
         self.app = app
         self.tasks: typing.Dict[typing.Callable[[], None],
                                 typing.Dict[str, float]] = {}
+        self.names: typing.Dict[typing.Callable[[], None], str] = {}
+        self._lock = threading.Lock()
+        # the soonest time any task is due
+        self._next_run = 0.0
 
-    def register(self, func: typing.Callable[[], None], interval: float):
+    def register(self, func: typing.Callable[[], None], interval: float,
+                 name: typing.Optional[str] = None):
         """ Registers a task to run periodically """
         self.tasks[func] = {'interval': interval}
+        self.names[func] = name or str(getattr(func, '__qualname__', None) or repr(func))
+        self._next_run = 0.0
 
     def run(self, force: bool = False):
         """ Run all pending tasks; 'force' will run all tasks whether they're
         pending or not. """
-        with self.app.app_context():
-            now = time.time()
-            for func, spec in self.tasks.items():
-                if force or now >= spec.get('next_run', 0):
-                    func()
-                    spec['next_run'] = now + spec['interval']
+        now = time.monotonic()
+        if not force and now < self._next_run:
+            return
+
+        pending = [(func, spec) for func, spec in self.tasks.items()
+                   if force or now >= spec.get('next_run', 0)]
+        if not pending:
+            return
+
+        # If another thread is already running maintenance, let it
+        if not self._lock.acquire(blocking=force):  # pylint:disable=consider-using-with
+            return
+
+        try:
+            with self.app.app_context():
+                for func, spec in pending:
+                    if force or now >= spec.get('next_run', 0):
+                        LOGGER.debug("Running maintenance task %s", self.names[func])
+                        func()
+                        spec['next_run'] = now + spec['interval']
+            self._next_run = min((spec.get('next_run', 0) for spec in self.tasks.values()),
+                                 default=float('inf'))
+        finally:
+            self._lock.release()
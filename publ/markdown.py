@@ -2,9 +2,11 @@
 """ markdown formatting functionality """
 # pylint:disable=consider-using-f-string
 
+import functools
 import html
 import logging
 import re
+import threading
 import typing
 import urllib.parse
 from typing import Optional
@@ -16,6 +18,7 @@ import pygments
 import pygments.formatters
 import pygments.lexers
 import slugify
+from werkzeug.utils import cached_property
 
 from . import html_entry, image, links, utils
 from .config import config
@@ -153,11 +156,16 @@ class HtmlRenderer(misaka.HtmlRenderer):
 
         self._counter = counter
 
-    def _inner(self, text):
-        """ process some inner markdown """
+    @cached_property
+    def processor(self) -> misaka.Markdown:
+        """ The Markdown processor which renders through this renderer """
         return misaka.Markdown(self,
                                self._config.get('markdown_extensions',
-                                                config.markdown_extensions))(text)
+                                                config.markdown_extensions))
+
+    def _inner(self, text):
+        """ process some inner markdown """
+        return self.processor(text)
 
     @staticmethod
     def footnotes(_):
@@ -545,9 +553,7 @@ def to_html(text, args, search_path,
                             footnote_buffer=footnotes,
                             entry_id=entry_id,
                             counter=counter)
-    processor = misaka.Markdown(renderer,
-                                args.get('markdown_extensions', config.markdown_extensions))
-    text = processor(text)
+    text = renderer.processor(text)
 
     if postprocess:
         # convert smartquotes, if so configured.
@@ -572,9 +578,17 @@ def to_html(text, args, search_path,
 
 def get_counters(text, args):
     """ Count the number of stateful items in Markdown text. """
+    return _count_items(text,
+                        tuple(args.get('markdown_extensions', config.markdown_extensions))
+                        ).copy()
+
+
+@functools.lru_cache(maxsize=512)
+def _count_items(text, extensions) -> ItemCounter:
+    """ Memoized backend for get_counters; the counts only depend on the text
+    and the enabled extensions """
     counter = ItemCounter()
-    processor = misaka.Markdown(counter,
-                                args.get('markdown_extensions', config.markdown_extensions))
+    processor = misaka.Markdown(counter, extensions)
     processor(text)
     return counter
 
@@ -586,6 +600,13 @@ class TitleRenderer(HtmlRenderer):
         super().__init__({}, [], entry_id=0, toc_buffer=[], footnote_buffer=[],
                          counter=ItemCounter())
 
+    def reset(self):
+        """ Clear out any state left over from rendering a previous title """
+        self._counter = ItemCounter()
+        self._footnote_ofs = 0
+        self._footnote_buffer.clear()
+        self._toc_buffer.clear()
+
     @staticmethod
     def paragraph(content):
         """ Passthrough """
@@ -611,6 +632,25 @@ class TitleRenderer(HtmlRenderer):
         return content
 
 
+_TITLE_PROCESSORS = threading.local()
+
+
+def _get_title_processor(extensions) -> misaka.Markdown:
+    """ Get a (thread-local) title processor for the given Markdown extensions """
+    processors = getattr(_TITLE_PROCESSORS, 'processors', None)
+    if processors is None:
+        processors = _TITLE_PROCESSORS.processors = {}
+
+    key = tuple(extensions)
+    processor = processors.get(key)
+    if processor is None:
+        processor = processors[key] = misaka.Markdown(TitleRenderer(), extensions=key)
+    else:
+        # Don't let footnotes or counts carry over between titles
+        processor.renderer.reset()
+    return processor
+
+
 def render_title(text, markup=True, smartquotes=True, markdown_extensions=None):
     """ Convert a Markdown title to HTML """
 
@@ -618,9 +658,8 @@ def render_title(text, markup=True, smartquotes=True, markdown_extensions=None):
     # later
     pfx, text = re.match(r'([0-9. ]*)(.*)', text).group(1, 2)
 
-    text = pfx + misaka.Markdown(TitleRenderer(),
-                                 extensions=markdown_extensions
-                                 or config.markdown_extensions)(text)
+    text = pfx + _get_title_processor(markdown_extensions
+                                      or config.markdown_extensions)(text)
 
     if smartquotes:
         text = misaka.smartypants(text)
@@ -29,6 +29,21 @@ def set_alias(alias: str, alias_type: model.AliasType, **kwargs) -> model.PathAl
     url -- The external URL to alias it to
     """
 
+    path, values = _parse_alias(alias, alias_type)
+    values.update(kwargs)
+
+    record = model.PathAlias.get(path=path)
+    if record:
+        record.set(**values)
+    else:
+        record = model.PathAlias(**values)
+
+    orm.commit()
+    return record
+
+
+def _parse_alias(alias: str, alias_type: model.AliasType) -> typing.Tuple[str, typing.Dict]:
+    """ Parse an alias specification into its path and its record values """
     spec = alias.split()
     path = spec[0]
 
@@ -36,7 +51,6 @@ def set_alias(alias: str, alias_type: model.AliasType, **kwargs) -> model.PathAl
         path = '/' + path
 
     values = {
-        **kwargs,
         'path': urllib.parse.unquote(path),
         'alias_type': alias_type.value
     }
@@ -44,14 +58,39 @@ def set_alias(alias: str, alias_type: model.AliasType, **kwargs) -> model.PathAl
     if len(spec) > 1:
         values['template'] = spec[1]
 
-    record = model.PathAlias.get(path=path)
-    if record:
-        record.set(**values)
+    return path, values
+
+
+@orm.db_session
+def set_aliases(target: typing.Union[model.Entry, model.Category],
+                aliases: typing.Iterable[typing.Tuple[str, model.AliasType]]):
+    """ Replace all of the aliases to a destination, leaving the database
+    alone if they haven't changed.
+
+    Arguments:
+
+    target -- The entry or category to alias to
+    aliases -- A list of (alias specification, alias type)
+    """
+    if isinstance(target, model.Entry):
+        kwargs = {'entry': target}
+    elif isinstance(target, model.Category):
+        kwargs = {'category': target}
     else:
-        record = model.PathAlias(**values)
+        raise TypeError(f"Unknown type {type(target)}")
 
-    orm.commit()
-    return record
+    aliases = list(aliases)
+    wanted = {(values['path'], values['alias_type'], values.get('template', ''))
+              for _, values in (_parse_alias(alias, alias_type)
+                                for alias, alias_type in aliases)}
+    current = {(record.path, record.alias_type, record.template)
+               for record in target.aliases}
+    if wanted == current:
+        return
+
+    remove_aliases(target)
+    for alias, alias_type in aliases:
+        set_alias(alias, alias_type, **kwargs)
 
 
 @orm.db_session
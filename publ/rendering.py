@@ -19,7 +19,7 @@ from .category import Category
 from .config import config
 from .entry import Entry
 from .entry import expire_record as entry_expire_record
-from .template import Template, map_template
+from .template import Template, map_template, map_template_filename
 
 LOGGER = logging.getLogger(__name__)
 
@@ -37,10 +37,22 @@ def cache_control():
         return 'private, no-cache'
 
     # page did not have a user dependency, so it's cacheable
-    timeout = config.cache.get('CACHE_DEFAULT_TIMEOUT', None)
-    if timeout:
-        return f'public, max-age={timeout}'
-    return 'public'
+    from .flask_wrapper import current_app
+    return current_app.public_cache_control
+
+
+def conditional_response(rendered: str, etag: str, content_type: str):
+    """ Build the response for a rendered page, or a 304 if the client already
+    has it """
+    headers = {
+        'ETag': f'"{etag}"',
+        'Cache-Control': cache_control(),
+    }
+
+    if caching.not_modified(etag):
+        return 'Not modified', 304, headers
+
+    return rendered, {'Content-Type': content_type, **headers}
 
 
 def mime_type(template: Template) -> str:
@@ -57,13 +69,21 @@ def get_template(template: str, relation) -> typing.Optional[str]:
     else:
         path = relation
 
-    tmpl = map_template(path, template)
-    return tmpl.filename if tmpl else None
+    return map_template_filename(path, template)
 
 
 def handle_path_alias(path: Optional[str] = None):
     """ Check to see if the current request is a redirection """
-    alias = path_alias.get_alias(path or request.path)
+    path = path or request.path
+
+    # A missing entry or canonical-URL mismatch checks for an alias before
+    # raising, and the error handler would then look the same path up again
+    if 'path_alias_misses' not in flask.g:
+        flask.g.path_alias_misses = set()  # pylint:disable=assigning-non-slot
+    if path in flask.g.path_alias_misses:
+        return None
+
+    alias = path_alias.get_alias(path)
 
     if isinstance(alias, path_alias.Response):
         return alias.response
@@ -74,6 +94,7 @@ def handle_path_alias(path: Optional[str] = None):
     if isinstance(alias, path_alias.AuthFailed):
         return handle_unauthorized(alias.cur_user, category=alias.category)
 
+    flask.g.path_alias_misses.add(path)
     return None
 
 
@@ -91,12 +112,25 @@ def image_function(template=None,
         # this too
         path += (category.search_path,)
     if template is not None:
-        path += (os.path.join(config.content_folder,
-                              os.path.dirname(template.filename)),)
+        path += (template.search_path,)
 
     return lambda filename: image.get_image(filename, path)
 
 
+@utils.stash
+@orm.db_session
+def _latest_entry() -> typing.Optional[int]:
+    """ Get the ID of the most recently-visible entry, for cache-busting; this
+    can't change within a request, so it's only looked up once """
+    cb_query = queries.build_query({})
+    cb_query = cb_query.order_by(orm.desc(model.Entry.utc_timestamp))
+    latest = cb_query.first()
+    if latest:
+        LOGGER.debug("Most recently-scheduled entry: %s", latest)
+        return latest.id
+    return None
+
+
 def render_publ_template(template: Template, is_error=True, **kwargs) -> typing.Tuple[str, str]:
     """ Render out a template, providing the image function based on the args.
 
@@ -104,8 +138,9 @@ def render_publ_template(template: Template, is_error=True, **kwargs) -> typing.
     """
     @cache.memoize(unless=caching.do_not_cache)
     def do_render(template: Template, **kwargs) -> typing.Tuple[str, str, typing.Dict]:
-        LOGGER.debug("Rendering template %s with args %s and kwargs %s; caching=%s",
-                     template, request.args, kwargs, not caching.do_not_cache())
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Rendering template %s with args %s and kwargs %s; caching=%s",
+                         template, request.args, kwargs, not caching.do_not_cache())
 
         args = {
             'template': template,
@@ -119,17 +154,6 @@ def render_publ_template(template: Template, is_error=True, **kwargs) -> typing.
         text = template.render(**args)
         return text, caching.get_etag(text), flask.g.get('needs_auth')
 
-    @orm.db_session
-    def latest_entry():
-        # Cache-busting query based on most recently-visible entry
-        cb_query = queries.build_query({})
-        cb_query = cb_query.order_by(orm.desc(model.Entry.utc_timestamp))
-        latest = cb_query.first()
-        if latest:
-            LOGGER.debug("Most recently-scheduled entry: %s", latest)
-            return latest.id
-        return None
-
     try:
         from . import __version__
         try:
@@ -145,7 +169,7 @@ def render_publ_template(template: Template, is_error=True, **kwargs) -> typing.
             _user_auth=cur_user.auth_groups if cur_user else None,
             _url=request.url,
             _index_time=index.last_indexed(),
-            _latest=latest_entry(),
+            _latest=_latest_entry(),
             _publ_version=__version__,
             _accept_mime=flask.request.accept_mimetypes,
             **kwargs)
@@ -336,12 +360,7 @@ def render_category_path(category: str, template: typing.Optional[str]):
         category=Category.load(category),
         view=view_obj)
 
-    if request.if_none_match.contains(etag):
-        return 'Not modified', 304, {'ETag': f'"{etag}"'}
-
-    return rendered, {'Content-Type': mime_type(template_impl),
-                      'ETag': f'"{etag}"',
-                      'Cache-Control': cache_control()}
+    return conditional_response(rendered, etag, mime_type(template_impl))
 
 
 @ orm.db_session
@@ -526,16 +545,8 @@ def render_entry_record(record: model.Entry, category: str, template: typing.Opt
         entry=entry_obj,
         category=Category.load(category))
 
-    if request.if_none_match.contains(etag):
-        return 'Not modified', 304
-
-    headers = {
-        'Content-Type': entry_obj.get('Content-Type', mime_type(tmpl)),
-        'ETag': etag,
-        'Cache-Control': cache_control()
-    }
-
-    return rendered, headers
+    return conditional_response(rendered, etag,
+                                entry_obj.get('Content-Type', mime_type(tmpl)))
 
 
 @orm.db_session(retry=5)
@@ -2,16 +2,20 @@
 """ Wrapper for template information """
 
 import fnmatch
-import glob
+import functools
 import hashlib
 import logging
 import mimetypes
 import os
+import posixpath
 import typing
 
 import arrow
 import flask
+import watchdog.events
+import watchdog.observers
 import werkzeug.exceptions as http_error
+from werkzeug.utils import cached_property
 
 from . import image, utils
 from .config import config
@@ -29,6 +33,10 @@ DEFAULT_ACCEPT = ['text/html',
                   'text/plain',
                   '*/*']
 
+# Template folders which are being watched for changes, and thus can have
+# their lookups cached
+_WATCHED_FOLDERS: typing.Set[str] = set()
+
 
 class Template:
     """ Template information wrapper """
@@ -47,23 +55,19 @@ class Template:
         # pylint:disable=too-many-arguments,too-many-positional-arguments
         self.name = name
 
-        # Flask expects template filenames to be /-separated regardless of
-        # platform
-        if os.sep != '/':
-            self.filename = '/'.join(os.path.normpath(filename).split(os.sep))
-        else:
-            self.filename = filename
+        self.filename = _flask_filename(filename)
 
         self.file_path = file_path
 
         if file_path:
-            self.mtime = os.stat(file_path).st_mtime
+            stat = os.stat(file_path)
+            self.mtime = stat.st_mtime
             self.last_modified = arrow.get(self.mtime)
-            self._fingerprint = utils.file_fingerprint(file_path)
+            self._fingerprint = utils.stat_fingerprint(stat)
 
         self.content = content
         if content:
-            self._fingerprint = hashlib.md5(content.encode('utf-8')).hexdigest()
+            self._fingerprint = _content_fingerprint(content)
 
         self.mime_type = mime_type if mime_type else mimetypes.guess_type(filename)[0]
 
@@ -85,10 +89,14 @@ class Template:
     def __hash__(self):
         return hash(self._key())
 
+    @cached_property
+    def search_path(self) -> str:
+        """ The content directory that corresponds to this template """
+        return os.path.join(config.content_folder, os.path.dirname(self.filename))
+
     def image(self, filename):
         """ Retrieve an image using our search path as the context """
-        search_path = (os.path.join(config.content_folder, os.path.dirname(self.filename)),)
-        return image.get_image(filename, search_path)
+        return image.get_image(filename, (self.search_path,))
 
 
 def map_template(category: str,
@@ -105,7 +113,46 @@ def map_template(category: str,
     category -- The path to map
     template_list -- A template to look up (as a string), or a list of templates.
     """
-    # pylint:disable=too-many-locals,too-many-branches
+
+    found = _find_template(category, template_list, in_exception)
+    if not found:
+        return None
+
+    name, filename, file_path, mime_type = found
+    if file_path:
+        try:
+            return Template(name, filename, file_path, mime_type=mime_type)
+        except FileNotFoundError:
+            # The template went away before the watchdog cleared the lookup cache
+            LOGGER.debug("Template %s disappeared; retrying lookup", file_path)
+            _resolve_template.cache_clear()
+            return map_template(category, template_list, in_exception)
+    return Template(name, filename, None, content=_get_builtin(filename), mime_type=mime_type)
+
+
+def map_template_filename(category: str,
+                          template_list: typing.Union[str, typing.List[str]]
+                          ) -> typing.Optional[str]:
+    """
+    Like map_template, but only returns the template's filename; this avoids
+    the work of loading the template's metadata.
+    """
+    found = _find_template(category, template_list)
+    return _flask_filename(found[1]) if found else None
+
+
+def _flask_filename(filename: str) -> str:
+    """ Flask expects template filenames to be /-separated regardless of
+    platform """
+    if os.sep != '/':
+        return '/'.join(os.path.normpath(filename).split(os.sep))
+    return filename
+
+
+def _find_template(category: str,
+                   template_list: typing.Union[str, typing.List[str]],
+                   in_exception=False):
+    """ Resolve a template for the current request's acceptance list """
 
     # get the sorted acceptance list
     accept_mime = [mime for (mime, _) in flask.request.accept_mimetypes]
@@ -117,6 +164,29 @@ def map_template(category: str,
     if not accept_mime or accept_mime == ['*/*']:
         accept_mime = DEFAULT_ACCEPT
 
+    template_folder = config.template_folder
+    args = (template_folder, category, tuple(utils.as_list(template_list)), tuple(accept_mime))
+    if template_folder in _WATCHED_FOLDERS:
+        return _resolve_template(*args)
+
+    # Without a watcher we can't know when to invalidate the cache
+    return _resolve_template_uncached(*args)
+
+
+def _resolve_template_uncached(template_folder: str,
+                               category: str,
+                               template_list: typing.Tuple[str, ...],
+                               accept_mime: typing.Tuple[str, ...]
+                               ) -> typing.Optional[typing.Tuple[str, str,
+                                                                 typing.Optional[str],
+                                                                 typing.Optional[str]]]:
+    """
+    Find the template file for map_template. Returns a tuple of
+    (name, filename, file_path, mime_type), where file_path is None for a
+    builtin template.
+    """
+    # pylint:disable=too-many-locals,too-many-branches
+
     # Get the MIME types that are also just glob matches
     accept_glob = [mime for mime in accept_mime if '*' in mime]
 
@@ -134,27 +204,50 @@ def map_template(category: str,
 
     could_glob = False
 
-    for template in utils.as_list(template_list):
-        path: typing.Optional[str] = os.path.normpath(category)
-        while path is not None:
-            LOGGER.debug("checking path %s for template %s", path, template)
+    # Normalize the category once, then build the list of directory prefixes
+    # from the category up to the template root; category paths are always
+    # '/'-separated, regardless of platform
+    path = posixpath.normpath(category).strip('/')
+    if path == '.':
+        path = ''
+    prefixes = []
+    while path:
+        prefixes.append(path + '/')
+        path, _, _ = path.rpartition('/')
+    prefixes.append('')
+
+    root = os.path.join(template_folder, '')
+
+    # List each directory once, rather than probing every candidate filename
+    listings: typing.Dict[str, typing.FrozenSet[str]] = {}
+
+    for template in template_list:
+        # a template name can include a subdirectory, which we need to list instead
+        template_dir, _, template_base = template.rpartition('/')
+
+        for prefix in prefixes:
+            LOGGER.debug("checking path %s for template %s", prefix, template)
+            folder = f'{prefix}{template_dir}/' if template_dir else prefix
+            if folder not in listings:
+                listings[folder] = _list_dir(f'{root}{folder}')
+            files = listings[folder]
+
             for mime, extension in extensions:
-                LOGGER.debug('path=%s mime=%s extension=%s', path, mime, extension)
-                candidate = os.path.join(path, template + extension)
-                file_path = os.path.join(config.template_folder, candidate)
-                if os.path.isfile(file_path):
+                LOGGER.debug('path=%s mime=%s extension=%s', prefix, mime, extension)
+                candidate = f'{folder}{template_base}{extension}'
+                file_path = f'{root}{candidate}'
+                if f'{template_base}{extension}' in files and os.path.isfile(file_path):
                     # Note that if the template is called out directly, this will
                     # not check if it matches the Accept: header. This technically
                     # violates HTTP but in any situation where the name is given
                     # directly there's almost certainly a */* in place.
                     #
                     # Properly checking Accept: in this context would be super annoying.
-                    return Template(template, candidate, file_path,
-                                    mime_type=mime)
+                    return template, candidate, file_path, mime
 
             # check for glob matches
-            glob_candidate = os.path.join(path, f'{template}.*')
-            glob_files = glob.glob(glob_candidate, root_dir=config.template_folder)
+            glob_files = [folder + name
+                          for name in sorted(fnmatch.filter(files, f'{template_base}.*'))]
             if glob_files:
                 could_glob = True
 
@@ -163,26 +256,18 @@ def map_template(category: str,
                     cmime, _ = mimetypes.guess_type(candidate)
                     if pattern == '*/*' or (cmime and fnmatch.fnmatch(cmime, pattern)):
                         LOGGER.debug("Found glob match: %s (%s)", candidate, cmime)
-                        return Template(template, candidate,
-                                        os.path.join(config.template_folder, candidate))
-
-            parent = os.path.dirname(path)
-            if parent != path:
-                path = parent
-            else:
-                path = None
+                        return template, candidate, f'{root}{candidate}', None
 
     # We didn't find one in the filesystem, so let's consult the builtins instead
-    for template in utils.as_list(template_list):
+    builtin_files = _list_builtins()
+    for template in template_list:
         for mime, extension in extensions:
             filename = template + extension
-            template_string = _get_builtin(filename)
-            if template_string:
-                return Template(template, filename, None,
-                                content=template_string, mime_type=mime)
+            if filename in builtin_files and _get_builtin(filename):
+                return template, filename, None, mime
 
         # check for glob matches
-        glob_files = glob.glob(f'{template}.*', root_dir=BUILTIN_DIR)
+        glob_files = sorted(fnmatch.filter(builtin_files, f'{template}.*'))
         if glob_files:
             could_glob = True
 
@@ -190,15 +275,68 @@ def map_template(category: str,
             for candidate in glob_files:
                 cmime, _ = mimetypes.guess_type(candidate)
                 if cmime and fnmatch.fnmatch(cmime, pattern):
-                    return Template(template, candidate, None, content=_get_builtin(candidate))
+                    return template, candidate, None, None
 
     if could_glob:
         # A precise match wasn't found, but could have been if there were a broader acceptance
-        raise http_error.NotAcceptable(f"Could not find match for {accept_mime}")
+        raise http_error.NotAcceptable(f"Could not find match for {list(accept_mime)}")
 
     return None
 
 
+_resolve_template = functools.lru_cache(maxsize=1024)(_resolve_template_uncached)
+
+
+class TemplateWatchdog(watchdog.events.FileSystemEventHandler):
+    """ Watchdog handler which invalidates the template lookup cache when
+    files are added to or removed from the template folder """
+
+    @staticmethod
+    def _invalidate(event):
+        LOGGER.debug("Template folder changed (%s); clearing lookup cache", event.src_path)
+        _resolve_template.cache_clear()
+
+    def on_created(self, event):
+        """ on_created handler """
+        self._invalidate(event)
+
+    def on_moved(self, event):
+        """ on_moved handler """
+        self._invalidate(event)
+
+    def on_deleted(self, event):
+        """ on_deleted handler """
+        self._invalidate(event)
+
+
+def background_watch(template_folder: str) -> None:
+    """ Start watching a template folder for changes, which enables caching
+    of template lookups """
+    if not os.path.isdir(template_folder):
+        return
+
+    observer = watchdog.observers.Observer()
+    observer.schedule(TemplateWatchdog(), template_folder, recursive=True)
+    LOGGER.info("Watching %s for template changes", template_folder)
+    observer.start()
+    _WATCHED_FOLDERS.add(template_folder)
+
+
+def _list_dir(path: str) -> typing.FrozenSet[str]:
+    """ Get the names in a directory, or an empty set if it can't be read """
+    try:
+        return frozenset(os.listdir(path))
+    except OSError:
+        return frozenset()
+
+
+@functools.lru_cache()
+def _list_builtins() -> typing.FrozenSet[str]:
+    """ Get the names of the builtin templates """
+    return _list_dir(BUILTIN_DIR)
+
+
+@functools.lru_cache()
 def _get_builtin(filename: str) -> typing.Optional[str]:
     """ Get a builtin template """
 
@@ -208,3 +346,9 @@ def _get_builtin(filename: str) -> typing.Optional[str]:
             return file.read()
 
     return None
+
+
+@functools.lru_cache(maxsize=64)
+def _content_fingerprint(content: str) -> str:
+    """ Get the fingerprint for a static template's content """
+    return hashlib.md5(content.encode('utf-8'), usedforsecurity=False).hexdigest()
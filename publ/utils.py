@@ -227,15 +227,19 @@ def make_tag(name: str,
 def file_fingerprint(fullpath: str) -> str:
     """ Get a metadata fingerprint for a file """
     try:
-        stat = os.stat(fullpath)
-        return ','.join([str(value)
-                         for value in [stat.st_ino, stat.st_mtime, stat.st_size]
-                         if value])
+        return stat_fingerprint(os.stat(fullpath))
     except FileNotFoundError:
         LOGGER.warning("Attempted to get fingerprint of nonexistent file %s", fullpath)
         return ''
 
 
+def stat_fingerprint(stat: os.stat_result) -> str:
+    """ Get a metadata fingerprint from an existing stat result """
+    return ','.join([str(value)
+                     for value in [stat.st_ino, stat.st_mtime, stat.st_size]
+                     if value])
+
+
 def remap_args(input_args: typing.Dict[str, typing.Any],
                remap: typing.Dict[str, typing.Union[str, ListLike[str]]]
                ) -> typing.Dict[str, typing.Any]:
@@ -286,6 +290,11 @@ def get_category(filename: str) -> str:
     return '/'.join(os.path.dirname(filename).split(os.sep))
 
 
+class StopParsing(Exception):
+    """ Raised by an HTMLTransform handler once it has all of the output it
+    needs, to skip the rest of the document """
+
+
 class HTMLTransform(html.parser.HTMLParser):
     """ Wrapper to HTMLParser to make it easier to build a SAX-style processor.
 
@@ -295,6 +304,8 @@ class HTMLTransform(html.parser.HTMLParser):
     * ``handle_endtag(self, tag)``
     * ``handle_data(self, data)``
     * ``handle_startendtag(self, tag, attrs)``
+
+    Any of these may raise StopParsing to end the parse early.
     """
 
     def __init__(self):
@@ -311,7 +322,10 @@ class HTMLTransform(html.parser.HTMLParser):
         Overrides the base class to ensure that it's handled like a plain string
         and not a MarkupSafe string (which causes double-escaping to happen)
         """
-        super().feed(str(data))
+        try:
+            super().feed(str(data))
+        except StopParsing:
+            pass
 
     def append(self, item: str):
         """ Append some text to the output """
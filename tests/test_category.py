@@ -0,0 +1,51 @@
+""" Tests of category objects """
+# pylint:disable=missing-function-docstring
+
+from pony import orm
+
+from publ import category
+
+from . import PublMock
+
+# Sibling names which sort around each other's subcategories
+CATEGORIES = sorted([
+    '',
+    'foo',
+    'foo bar',
+    'foo bar/x',
+    'foo-bar',
+    'foo-bar/baz',
+    'foo.d/x',
+    'foo/bar',
+    'foo/bar/baz',
+    'foo/qux/deep',
+    'foo0',
+    'food',
+])
+
+
+def _paths(cats):
+    return sorted(str(cat) for cat in cats)
+
+
+def test_subcats(mocker):
+    mocker.patch('publ.category._visible_categories', return_value=CATEGORIES)
+
+    app = PublMock()
+    with app.test_request_context('/'), orm.db_session():
+        root = category.Category.load('')
+        assert _paths(root.subcats()) == [
+            'foo', 'foo bar', 'foo-bar', 'foo.d', 'foo0', 'food']
+        assert _paths(root.subcats(recurse=True)) == [c for c in CATEGORIES if c]
+
+        parent = category.Category.load('foo')
+        assert _paths(parent.subcats()) == ['foo/bar', 'foo/qux']
+        assert _paths(parent.subcats(recurse=True)) == [
+            'foo/bar', 'foo/bar/baz', 'foo/qux/deep']
+
+        assert _paths(category.Category.load('foo-bar').subcats()) == ['foo-bar/baz']
+        assert _paths(category.Category.load('foo bar').subcats(recurse=True)) == [
+            'foo bar/x']
+        assert _paths(category.Category.load('foo/bar').subcats()) == ['foo/bar/baz']
+        assert not category.Category.load('foo/bar/baz').subcats()
+        assert not category.Category.load('foo0').subcats()
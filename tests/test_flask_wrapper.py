@@ -0,0 +1,123 @@
+""" Tests of the Publ application wrapper """
+# pylint:disable=missing-function-docstring
+
+import os
+
+from pony import orm
+
+from publ import model
+from publ.flask_wrapper import PathRegexes, Publ
+
+
+def _make_app(mocker, tmp_path, **cfg) -> Publ:
+    """ Make a Publ app against the already-configured test index """
+    mocker.patch('publ.model.setup')
+    mocker.patch('publ.index.scan_index')
+    mocker.patch.object(Publ, '_instance', None)
+
+    for folder in ('content', 'templates', 'static'):
+        os.makedirs(tmp_path / folder, exist_ok=True)
+
+    return Publ(__name__, {
+        'content_folder': str(tmp_path / 'content'),
+        'template_folder': str(tmp_path / 'templates'),
+        'static_folder': str(tmp_path / 'static'),
+        'index_rescan_interval': 0,
+        'index_enable_watchdog': False,
+        **cfg
+    })
+
+
+def _make_regexes(*extra):
+    regexes = PathRegexes()
+    regexes.add(r'/comic/([0-9]+)$', lambda match: (f'/comics/{match.group(1)}', True))
+    # declines to redirect, so later handlers get a chance
+    regexes.add(r'/comic/', lambda match: (None, False))
+    regexes.add(r'/comic/(.*)', lambda match: (f'/comics/?q={match.group(1)}', False))
+    regexes.add(r'/blog/(.*)', lambda match: (f'/{match.group(1)}', True))
+    for regex in extra:
+        regexes.add(regex, lambda match: ('/extra', False))
+    return regexes
+
+
+def _check_regexes(regexes):
+    assert regexes.test('/comic/123') == ('/comics/123', True)
+    assert regexes.test('/comic/abc') == ('/comics/?q=abc', False)
+    assert regexes.test('/blog/foo/bar') == ('/foo/bar', True)
+    assert regexes.test('/nothing/here') == (None, None)
+    assert regexes.test('/comic') == (None, None)
+
+    # cached lookups give the same results
+    assert regexes.test('/comic/123') == ('/comics/123', True)
+    assert regexes.test('/nothing/here') == (None, None)
+
+
+def test_path_regex_combined():
+    regexes = _make_regexes()
+    assert regexes._get_combined()  # pylint:disable=protected-access
+    _check_regexes(regexes)
+
+
+def test_path_regex_fallback():
+    # a backreference means the patterns can't be combined
+    regexes = _make_regexes(r'/(x)\1$')
+    assert regexes._get_combined() is None  # pylint:disable=protected-access
+    _check_regexes(regexes)
+    assert regexes.test('/xx') == ('/extra', False)
+
+
+def test_path_regex_added_later():
+    regexes = _make_regexes()
+    assert regexes.test('/late/1') == (None, None)
+
+    regexes.add(r'/late/', lambda match: ('/late', False))
+    assert regexes.test('/late/1') == ('/late', False)
+    _check_regexes(regexes)
+
+
+def test_x_sendfile(mocker, tmp_path):
+    with open(tmp_path / 'asset.txt', 'w', encoding='utf-8') as file:
+        file.write('asset')
+
+    for enabled in (False, True):
+        app = _make_app(mocker, tmp_path, use_x_sendfile=enabled)
+        with open(tmp_path / 'static' / 'file.txt', 'w', encoding='utf-8') as file:
+            file.write('static')
+
+        with orm.db_session:
+            record = model.Image(file_path=str(tmp_path / 'asset.txt'),
+                                 checksum='x', fingerprint='x',
+                                 is_asset=True, asset_name='_sendfile_test.txt')
+            orm.commit()
+
+        try:
+            with app.test_client() as client:
+                for url, path in (('/static/file.txt', tmp_path / 'static' / 'file.txt'),
+                                  ('/_file/_sendfile_test.txt', tmp_path / 'asset.txt')):
+                    response = client.get(url)
+                    assert response.status_code == 200
+                    if enabled:
+                        assert response.headers.get('X-Sendfile') == str(path)
+                    else:
+                        assert 'X-Sendfile' not in response.headers
+                        assert response.get_data(as_text=True) in ('static', 'asset')
+                    response.close()
+        finally:
+            with orm.db_session:
+                model.Image[record.file_path].delete()
+
+
+def test_template_cache_folder(mocker, tmp_path):
+    cache_folder = tmp_path / 'template_cache'
+    app = _make_app(mocker, tmp_path, template_cache_folder=str(cache_folder))
+    assert os.path.isdir(cache_folder)
+
+    with open(tmp_path / 'templates' / 'index.html', 'w', encoding='utf-8') as file:
+        file.write('category {{ category.path }}')
+
+    with app.test_client() as client:
+        response = client.get('/')
+        assert response.status_code == 200
+        assert response.get_data(as_text=True) == 'category '
+
+    assert [name for name in os.listdir(cache_folder) if name.endswith('.cache')]
@@ -122,6 +122,50 @@ def test_first_paragraph():
     assert processor.get_data() == 'Bare text'
 
 
+def test_first_paragraph_early_stop():
+    from publ.html_entry import FirstParagraph
+
+    class FullParse(FirstParagraph):
+        """ Parses the whole document, for comparison """
+
+        def _check_done(self):
+            pass
+
+    class SeenData(FirstParagraph):
+        """ Records all of the text the parser was given """
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.seen = []
+
+        def handle_data(self, data):
+            self.seen.append(data)
+            super().handle_data(data)
+
+    docs = [
+        '<p>Para 1</p><p>Para 2</p><div><p>Para 3</p></div>',
+        '<p>Para <em>1</em></p>\n<ul><li>item</li></ul><p>Para 2</p>',
+        '<div><p>Para 1</p><p>Para 2</p></div><p>Para 3</p>',
+        '<blockquote><p>Para 1</p>more</blockquote><p>Para 2</p>',
+        '<h1>Heading</h1><p>Para 1</p><p>Para 2 <a href="foo">link</a></p>',
+        'Bare text<p>Para 1</p><p>Para 2</p>',
+        '<p><img src="foo"></p><p>Para 1</p><p>Para 2</p>',
+    ]
+    for doc in docs:
+        for strip_tag in (False, True):
+            early = FirstParagraph(strip_tag=strip_tag)
+            early.feed(doc)
+            full = FullParse(strip_tag=strip_tag)
+            full.feed(doc)
+            assert early.get_data() == full.get_data(), (doc, strip_tag)
+
+    # make sure it actually stopped early
+    processor = SeenData()
+    processor.feed('<p>Para 1</p><p>Para 2</p><p>Para 3</p>')
+    assert processor.get_data() == '<p>Para 1</p>'
+    assert 'Para 2' not in processor.seen
+
+
 def test_first_paragraph_filter():
     from publ.html_entry import first_paragraph
 
@@ -1,12 +1,18 @@
 """ Tests of image-related functionality """
 
+import concurrent.futures
 import logging
 import os
 import os.path
 import tempfile
+import threading
 import time
+import types
+
+import PIL.Image
 
 import publ.image
+from publ.image.local import LocalImage
 
 from . import PublMock
 
@@ -57,3 +63,50 @@ def test_clean_cache():
         assert os.path.isfile(get_path('foo', 'poiu'))
         assert not os.path.exists(get_path('bar', 'qwer'))
         assert not os.path.exists(get_path('bar'))
+
+
+def test_pending_rendition(mocker):
+    """ Test that concurrent requests for a rendition share one render job """
+    # pylint:disable=too-many-locals
+    with tempfile.TemporaryDirectory() as tempdir:
+        app = PublMock({
+            'static_folder': tempdir,
+            'image_output_subdir': 'images'
+        })
+
+        source = os.path.join(tempdir, 'source.png')
+        PIL.Image.new('RGB', (20, 20)).save(source)
+        record = types.SimpleNamespace(file_path=source, checksum='0123456789abcdef',
+                                       width=20, height=20, transparent=False)
+        image = LocalImage(record, [tempdir])
+
+        # hold the render until we've made all of the requests
+        release = threading.Event()
+        real_render = LocalImage._render  # pylint:disable=protected-access
+
+        def slow_render(*args):
+            release.wait(5)
+            real_render(*args)
+
+        render = mocker.patch.object(LocalImage, '_render', autospec=True,
+                                     side_effect=slow_render)
+
+        def request(wait):
+            with app.test_request_context('/'):
+                return image.render_async(1, wait=wait, width=10)
+
+        first_url, _, first_pending = request(0)
+        second_url, _, second_pending = request(0)
+        assert first_pending and second_pending
+        assert first_url == second_url
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            waiting = [pool.submit(request, 5) for _ in range(2)]
+            release.set()
+            results = [future.result() for future in waiting]
+
+        assert render.call_count == 1
+        for url, _, pending in results:
+            assert url == first_url
+            assert not pending
+        assert os.path.isfile(os.path.join(tempdir, first_url[len('/static/'):]))
@@ -28,3 +28,30 @@ def test_render_title():
         assert markdown.render_title('The "sun" is a liberal myth',
                                      markup=True, smartquotes=True) == \
             'The &ldquo;sun&rdquo; is a liberal myth'
+
+
+def test_title_processor_reset():
+    # pylint:disable=protected-access
+    app = PublMock()
+    with app.app_context():
+        extensions = ('footnotes', 'strikethrough')
+        processor = markdown._get_title_processor(extensions)
+        renderer = processor.renderer
+
+        # leave behind some state from a previous render
+        renderer._counter.footnote = 3
+        renderer._counter.toc = 2
+        renderer._counter.code_blocks = 1
+        renderer._footnote_ofs = 3
+        renderer._footnote_buffer.append('stray footnote')
+        renderer._toc_buffer.append((1, 'stray heading'))
+
+        # the processor gets reused, but with none of that state
+        assert markdown._get_title_processor(extensions) is processor
+        assert str(renderer._counter) == str(markdown.ItemCounter())
+        assert renderer._footnote_ofs == 0
+        assert not renderer._footnote_buffer
+        assert not renderer._toc_buffer
+
+        assert markdown.render_title("Not *stale*", markdown_extensions=extensions) == \
+            "Not <em>stale</em>"
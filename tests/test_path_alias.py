@@ -0,0 +1,52 @@
+""" Tests of path alias management """
+# pylint:disable=missing-function-docstring
+
+from pony import orm
+
+from publ import model, path_alias
+
+from . import PublMock
+
+
+def test_set_aliases(mocker):
+    app = PublMock()
+    with app.test_request_context('/'), orm.db_session():
+        record = model.Category(category='_alias_test', file_path='_alias_test.cat')
+        try:
+            path_alias.set_aliases(record, [
+                ('/_alias_test/old', model.AliasType.REDIRECT),
+                ('/_alias_test/kept kept_template', model.AliasType.MOUNT),
+            ])
+            assert {alias.path for alias in record.aliases} == {
+                '/_alias_test/old', '/_alias_test/kept'}
+
+            # reindexing with a changed list removes the stale alias, and
+            # keeps the one that's still wanted
+            path_alias.set_aliases(record, [
+                ('/_alias_test/kept kept_template', model.AliasType.MOUNT),
+                ('/_alias_test/new', model.AliasType.REDIRECT),
+            ])
+            assert model.PathAlias.get(path='/_alias_test/old') is None
+
+            kept = model.PathAlias.get(path='/_alias_test/kept')
+            assert kept.category == record
+            assert kept.template == 'kept_template'
+            assert kept.alias_type == model.AliasType.MOUNT.value
+
+            new = model.PathAlias.get(path='/_alias_test/new')
+            assert new.category == record
+            assert new.alias_type == model.AliasType.REDIRECT.value
+
+            # an unchanged list leaves the records alone
+            spy = mocker.spy(path_alias, 'set_alias')
+            path_alias.set_aliases(record, [
+                ('/_alias_test/new', model.AliasType.REDIRECT),
+                ('/_alias_test/kept kept_template', model.AliasType.MOUNT),
+            ])
+            assert spy.call_count == 0
+            assert {alias.path for alias in record.aliases} == {
+                '/_alias_test/kept', '/_alias_test/new'}
+        finally:
+            path_alias.remove_aliases(record)
+            record.delete()
+            orm.commit()
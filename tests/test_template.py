@@ -0,0 +1,75 @@
+""" Tests of template mapping """
+# pylint:disable=missing-function-docstring
+
+import os
+import tempfile
+import time
+
+from publ import template
+
+from . import PublMock
+
+TEMPLATE_FOLDER = os.path.join(os.path.dirname(__file__), 'templates')
+
+
+def test_map_template_subdirectory():
+    app = PublMock({'template_folder': TEMPLATE_FOLDER})
+    with app.test_request_context('/'):
+        found = template.map_template('subtemplate', 'sub-a/_fragment')
+        assert found
+        assert found.filename == 'subtemplate/sub-a/_fragment.html'
+        assert found.file_path == os.path.join(TEMPLATE_FOLDER,
+                                               'subtemplate/sub-a/_fragment.html')
+
+        # names with a subdirectory fall back to parent categories too
+        found = template.map_template('subtemplate/sub-b', 'sub-a/_fragment')
+        assert found
+        assert found.filename == 'subtemplate/sub-a/_fragment.html'
+
+        assert template.map_template_filename(
+            '', 'subtemplate/_fragment') == 'subtemplate/_fragment.html'
+
+        assert template.map_template('subtemplate', 'sub-c/_fragment') is None
+
+
+def test_map_template_parent_category():
+    app = PublMock({'template_folder': TEMPLATE_FOLDER})
+    with app.test_request_context('/'):
+        # the nearest category directory with the template wins
+        found = template.map_template('subtemplate/sub-a/deeper', '_fragment')
+        assert found
+        assert found.filename == 'subtemplate/sub-a/_fragment.html'
+
+        # skipping over intermediate directories that don't have it
+        found = template.map_template('subtemplate/sub-a/deeper', 'index')
+        assert found
+        assert found.filename == 'subtemplate/index.html'
+
+        found = template.map_template('subtemplate/sub-b/', 'entry')
+        assert found
+        assert found.filename == 'entry.html'
+
+
+def test_watched_lookup_invalidation():
+    def wait_for(check):
+        # give the watchdog thread a moment to see the change
+        deadline = time.time() + 5
+        while not check() and time.time() < deadline:
+            time.sleep(0.05)
+        return check()
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        app = PublMock({'template_folder': tempdir})
+        template.background_watch(tempdir)
+
+        with app.test_request_context('/'):
+            # the miss gets cached while the folder is watched
+            assert template.map_template('', 'foo') is None
+            assert template.map_template('', 'foo') is None
+
+            with open(os.path.join(tempdir, 'foo.html'), 'w', encoding='utf-8') as file:
+                file.write('foo')
+            assert wait_for(lambda: template.map_template('', 'foo') is not None)
+
+            os.remove(os.path.join(tempdir, 'foo.html'))
+            assert wait_for(lambda: template.map_template('', 'foo') is None)